@@ -6,12 +6,19 @@ creates an HTML report, and optionally emails a TLDR digest.
 
 Environment variables for email configuration:
     SMTP_HOST: SMTP server host
-    SMTP_PORT: SMTP server port (default: 587)
+    SMTP_PORT: SMTP server port (default: 587; 465 uses implicit TLS)
     SMTP_USER: username for SMTP authentication
     SMTP_PASS: password for SMTP authentication
     EMAIL_FROM: email address of the sender
     EMAIL_TO: comma-separated list of recipients
 
+Set OPENAI_API_KEY to enable LLM summaries and drawbacks. SUMMARY_BATCH_SIZE
+(default: 10) sets how many articles share one summary request; use 1 to
+send one concurrent request per article. SUMMARY_BACKEND picks where
+summaries come from: "openai" (default), "ollama" (a local model at
+OLLAMA_URL, model OLLAMA_MODEL) or "openrouter" (needs OPENROUTER_API_KEY,
+model OPENROUTER_MODEL); OpenAI remains the fallback.
+
 Usage:
     python news_agent.py --config feeds.yaml --output public/index.html \
         --json frontend/public/articles.json --send-email
@@ -19,29 +26,76 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
+import logging
 import os
+import re
 import smtplib
-from dataclasses import dataclass, field
+import sqlite3
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import date
 from email.mime.text import MIMEText
+from html.parser import HTMLParser
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
 
+import aiohttp
 import feedparser
 import jinja2
 import yaml
-import re
-from html import unescape
-from typing import Optional
 
 try:
     import openai
 except Exception:  # pragma: no cover - openai is optional
     openai = None
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
 
-@dataclass
+try:
+    import brotli  # lets aiohttp decode br-encoded responses
+except Exception:  # pragma: no cover - only gzip/deflate are requested then
+    brotli = None
+
+try:
+    import feedparser_rs
+except Exception:  # pragma: no cover - optional Rust-backed parser
+    feedparser_rs = None
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ijson
+except Exception:  # pragma: no cover - fall back to loading the whole file
+    ijson = None
+
+try:
+    import ahocorasick
+except Exception:  # pragma: no cover - fall back to plain substring scans
+    ahocorasick = None
+
+log = logging.getLogger(__name__)
+
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?]) +")
+_WS_RE = re.compile(r"\s+")
+
+
+@dataclass(slots=True)
 class Article:
     """Representation of a news article."""
 
@@ -51,9 +105,17 @@ class Article:
     published: str | None = None
     source: str | None = None
     category: str | None = None
+    drawback: str | None = None
+    # Plain-text body used as LLM input; not persisted
+    text: str | None = field(default=None, repr=False, compare=False)
 
+    def to_cache(self) -> Dict:
+        data = asdict(self)
+        del data["text"]
+        return data
 
-@dataclass
+
+@dataclass(slots=True)
 class Feed:
     """Configuration for a single RSS feed."""
 
@@ -62,61 +124,372 @@ class Feed:
     max_items: int = 5
     category: str = "vendor"
 
+    def __post_init__(self) -> None:
+        # Every article takes its source from here, and the source keys the
+        # digest, VENDOR_WEAKNESSES and the drawback caches
+        self.name = sys.intern(self.name)
+
 
 @dataclass
 class Digest:
     """Collection of articles grouped by source."""
 
-    feeds: Dict[str, List[Article]] = field(default_factory=dict)
+    feeds: Dict[str, List[Article]] = field(default_factory=lambda: defaultdict(list))
 
     def add(self, article: Article) -> None:
-        self.feeds.setdefault(article.source or "Unknown", []).append(article)
+        self.feeds[article.source or "Unknown"].append(article)
+
+    def add_many(self, source: str, articles: Iterable[Article]) -> None:
+        self.feeds[source].extend(articles)
 
     def to_text(self) -> str:
         lines: List[str] = []
         for source, articles in self.feeds.items():
             lines.append(f"{source}:")
             for art in articles:
-                lines.append(f"- {art.title}")
-                if art.summary:
-                    lines.append(f"  {art.summary}")
+                summary = f"  {art.summary}\n" if art.summary else ""
                 lines.append(
-                    f"  Potential drawback: {suggest_drawback(art.title, art.summary, art.source)}"
+                    f"- {art.title}\n{summary}"
+                    f"  Potential drawback: {art.drawback}\n  {art.link}\n"
                 )
-                lines.append(f"  {art.link}")
-                lines.append("")
         return "\n".join(lines).strip()
 
 
 def load_feeds(path: str | Path) -> List[Feed]:
     with open(path, "r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
+        data = yaml.load(fh, Loader=YamlLoader)
     feeds = [Feed(**item) for item in data.get("feeds", [])]
     return feeds
 
 
-def fetch_feed(feed: Feed) -> Iterable[Article]:
-    parsed = feedparser.parse(feed.url)
+def fetch_feed(
+    feed: Feed,
+    parsed: feedparser.FeedParserDict | None = None,
+    known: Dict[str, tuple[str | None, str | None]] | None = None,
+) -> Iterable[Article]:
+    """Yield articles from an already ``parsed`` feed, else from ``feed.url``.
+
+    Links found in ``known`` reuse their archived summary and drawback and
+    skip all summary work.
+    """
+    if parsed is None:
+        parsed = feedparser.parse(feed.url)
+    known = known or {}
     for entry in parsed.entries[: feed.max_items]:
-        summary = extract_summary(entry)
+        link = entry.get("link", "")
+        drawback = text = None
+        if link in known:
+            summary, drawback = known[link]
+        else:
+            summary = plain_summary(entry)
+            text = None if summary else extract_text(entry)
         yield Article(
             title=entry.get("title", ""),
-            link=entry.get("link", ""),
-            summary=summary,
+            link=link,
+            summary=summary or extract_summary(text),
             published=entry.get("published"),
             source=feed.name,
             category=feed.category,
+            drawback=drawback,
+            text=text,
         )
 
 
-def build_digest(feeds: List[Feed]) -> Digest:
-    digest = Digest()
+def _entry_dict(entry) -> feedparser.FeedParserDict:
+    """Adapt a feedparser-rs entry to the fields fetch_feed reads."""
+    content = [
+        {"value": getattr(c, "value", None)} for c in getattr(entry, "content", None) or []
+    ]
+    return feedparser.FeedParserDict(
+        title=getattr(entry, "title", None) or "",
+        link=getattr(entry, "link", None) or "",
+        summary=getattr(entry, "summary", None),
+        published=getattr(entry, "published", None),
+        content=content,
+    )
+
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_ENTRY_TAGS = ("item", _ATOM_NS + "entry")
+# Only core RSS 2.0 (no namespace), Atom and content:encoded are read;
+# extension elements such as media:description or itunes:title are ignored
+_FIELD_TAGS = {
+    "title": "title",
+    _ATOM_NS + "title": "title",
+    "link": "link",
+    _ATOM_NS + "link": "link",
+    "description": "summary",
+    _ATOM_NS + "summary": "summary",
+    "{http://purl.org/rss/1.0/modules/content/}encoded": "content",
+    _ATOM_NS + "content": "content",
+    "pubDate": "published",
+    _ATOM_NS + "published": "published",
+    "guid": "guid",
+}
+
+
+def stream_entries(body: bytes, max_items: int) -> List[feedparser.FeedParserDict]:
+    """Pull the first ``max_items`` entries from a well-formed RSS or Atom feed.
+
+    Reading stops as soon as enough entries are found, and each entry's
+    elements are cleared once extracted. Raises ``ET.ParseError`` for
+    documents that are not well-formed XML.
+    """
+    entries: List[feedparser.FeedParserDict] = []
+    if max_items <= 0:
+        return entries
+    for _, elem in ET.iterparse(BytesIO(body), events=("end",)):
+        if elem.tag not in _ENTRY_TAGS:
+            continue
+        entry = feedparser.FeedParserDict(content=[])
+        permalink = ""
+        for child in elem:
+            name = _FIELD_TAGS.get(child.tag)
+            if name is None:
+                continue
+            text = "".join(child.itertext()).strip()
+            if name == "title":
+                entry["title"] = text
+            elif name == "link" and "link" not in entry:
+                # Atom puts the URL in href; only the alternate link is the article
+                if child.get("href") is None:
+                    if text:
+                        entry["link"] = text
+                elif child.get("rel", "alternate") == "alternate":
+                    entry["link"] = child.get("href")
+            elif name == "guid" and child.get("isPermaLink", "true") != "false":
+                permalink = permalink or text
+            elif name == "summary" and text:
+                entry["summary"] = text
+            elif name == "content" and text:
+                entry["content"].append({"value": text})
+            elif name == "published" and text:
+                entry["published"] = text
+        # Like feedparser, items without a <link> fall back to a permalink guid
+        entry.setdefault("link", permalink)
+        entries.append(entry)
+        elem.clear()
+        if len(entries) >= max_items:
+            break
+    return entries
+
+
+def _is_absolute(link: str) -> bool:
+    parts = urlsplit(link)
+    return bool(parts.scheme and parts.netloc)
+
+
+def parse_feed_body(body: bytes, max_items: int) -> feedparser.FeedParserDict:
+    """Parse the first ``max_items`` entries of a downloaded feed.
+
+    Well-formed feeds are streamed with :func:`stream_entries`; malformed
+    ones go to feedparser-rs when it is installed, then feedparser. So do
+    feeds with a missing or relative link, which need feedparser's
+    ``xml:base`` resolution.
+    """
+    try:
+        entries = stream_entries(body, max_items)
+    except ET.ParseError:
+        entries = []
+    if entries and all(_is_absolute(e["link"]) for e in entries):
+        return feedparser.FeedParserDict(entries=entries)
+    if feedparser_rs is not None:
+        try:
+            limits = feedparser_rs.ParserLimits(
+                max_entries=max_items * 4, max_feed_size_bytes=50_000_000
+            )
+            parsed = feedparser_rs.parse(body, limits=limits)
+            return feedparser.FeedParserDict(
+                entries=[_entry_dict(e) for e in parsed.entries]
+            )
+        except Exception:
+            # Its error types are not part of a stable API, so log whatever it
+            # raised; an API mismatch would otherwise hide a dead Rust path
+            log.warning(
+                "feedparser-rs failed, falling back to feedparser", exc_info=True
+            )
+    return feedparser.parse(body)
+
+
+def dump_json(obj) -> bytes:
+    """Encode ``obj`` as indented UTF-8 JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def load_json(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """Yield a temporary path that replaces ``path`` once the block succeeds.
+
+    Readers of ``path`` never see a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        yield tmp
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    with atomic_path(path) as tmp:
+        tmp.write_bytes(data)
+
+
+FETCH_HEADERS = {
+    "Accept-Encoding": "gzip, deflate, br" if brotli is not None else "gzip, deflate",
+    "User-Agent": "news-agent/1.0",
+}
+
+
+def load_feed_cache(path: Path) -> Dict[str, Dict]:
+    """Load the per-URL conditional GET cache, or an empty one."""
+    if path.exists():
+        try:
+            return load_json(path.read_bytes())
+        except ValueError:
+            pass
+    return {}
+
+
+def save_feed_cache(cache: Dict[str, Dict], path: Path) -> None:
+    write_atomic(path, dump_json(cache))
+
+
+async def fetch_bytes(
+    session: aiohttp.ClientSession, url: str, cached: Dict | None = None
+) -> tuple[int | None, bytes | None, Dict[str, str | None]]:
+    """Download a feed body using any cached ETag/Last-Modified validators.
+
+    Returns ``(status, body, validators)``; ``status`` is ``None`` if the
+    request failed and ``body`` is ``None`` on a 304.
+    """
+    headers: Dict[str, str] = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+    try:
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return 304, None, {}
+            resp.raise_for_status()
+            validators = {
+                "etag": resp.headers.get("ETag"),
+                "modified": resp.headers.get("Last-Modified"),
+            }
+            return resp.status, await resp.read(), validators
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None, None, {}
+
+
+async def build_digest_async(
+    feeds: List[Feed],
+    cache: Dict[str, Dict] | None = None,
+    known: Dict[str, tuple[str | None, str | None]] | None = None,
+) -> Digest:
+    """Download all feeds concurrently and collect their articles.
+
+    When ``cache`` is given, unchanged feeds (HTTP 304, or a body identical
+    to the last one) reuse the articles stored from the previous run and
+    ``cache`` is updated in place. Links in ``known`` (see
+    :func:`load_known_articles`) are not summarised again.
+    """
+    cache = cache if cache is not None else {}
+    # Feeds sharing a URL are downloaded and parsed only once
+    urls = list(dict.fromkeys(feed.url for feed in feeds))
+    responses: Dict[str, tuple] = {}
+    # Bound concurrent requests overall and per host to avoid hammering servers
+    semaphore = asyncio.Semaphore(10)
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=4, ttl_dns_cache=300)
+
+    async def download(session: aiohttp.ClientSession, url: str) -> None:
+        async with semaphore:
+            responses[url] = await fetch_bytes(session, url, cache.get(url))
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers=FETCH_HEADERS,
+        # One slow server must not stall the whole run
+        timeout=aiohttp.ClientTimeout(total=15, connect=5),
+    ) as session:
+        async with asyncio.TaskGroup() as tg:
+            for url in urls:
+                tg.create_task(download(session, url))
+
+    parses: Dict[str, asyncio.Future] = {}
+    max_items: Dict[str, int] = {}
     for feed in feeds:
-        for article in fetch_feed(feed):
-            digest.add(article)
+        max_items[feed.url] = max(max_items.get(feed.url, 0), feed.max_items)
+    fetched: Dict[str, tuple[Dict, List[Article]]] = {}
+
+    async def collect(
+        feed: Feed, status: int | None, body: bytes | None, validators: Dict
+    ) -> List[Article]:
+        entry = cache.get(feed.url)
+        cached = (
+            [
+                Article(**{**item, "source": feed.name, "category": feed.category})
+                for item in entry.get("articles", [])[: feed.max_items]
+            ]
+            if entry
+            else []
+        )
+        if status == 304 and entry:
+            return cached
+        if body is None:
+            return []
+        body_sha = hashlib.sha256(body).hexdigest()
+        if entry and entry.get("body_sha") == body_sha:
+            # Same body from a server that ignores conditional requests
+            cache[feed.url] = {**entry, **validators}
+            return cached
+        # Parsing is blocking, so keep it off the event loop
+        if feed.url not in parses:
+            parses[feed.url] = asyncio.ensure_future(
+                asyncio.to_thread(parse_feed_body, body, max_items[feed.url])
+            )
+        parsed = await parses[feed.url]
+        articles = await asyncio.to_thread(lambda: list(fetch_feed(feed, parsed, known)))
+        # The cache serves every feed on this URL, so keep the longest list
+        if feed.max_items == max_items[feed.url]:
+            fetched[feed.url] = ({**validators, "body_sha": body_sha}, articles)
+        return articles
+
+    results = await asyncio.gather(
+        *[collect(feed, *responses[feed.url]) for feed in feeds]
+    )
+
+    # Only freshly parsed articles carry their text; the rest may need a drawback
+    await enrich_articles([a for articles in results for a in articles])
+
+    for url, (validators, articles) in fetched.items():
+        cache[url] = {**validators, "articles": [a.to_cache() for a in articles]}
+
+    digest = Digest()
+    for feed, articles in zip(feeds, results):
+        if articles:
+            digest.add_many(feed.name, articles)
     return digest
 
 
+def build_digest(
+    feeds: List[Feed],
+    cache: Dict[str, Dict] | None = None,
+    known: Dict[str, tuple[str | None, str | None]] | None = None,
+) -> Digest:
+    """Synchronous wrapper around :func:`build_digest_async`."""
+    return asyncio.run(build_digest_async(feeds, cache, known))
+
+
 VENDOR_WEAKNESSES = {
     "Databricks": "Lacks ThoughtSpot's search-driven analytics and natural language exploration.",
     "Snowflake": "Developer-focused Cortex tools can't match ThoughtSpot's self-service search.",
@@ -130,6 +503,62 @@ VENDOR_WEAKNESSES = {
 }
 
 
+# Keyword groups in priority order; the first group with a hit wins.
+DRAWBACK_RULES = [
+    (("security", "breach", "privacy"), "May raise security and compliance concerns."),
+    (
+        ("ai", "machine learning", "automation"),
+        "Could require significant compute resources and expert oversight.",
+    ),
+    (("cloud", "saas"), "Relies on external infrastructure and possible vendor lock-in."),
+    (("partnership", "integration"), "Integration complexity and potential data silos."),
+    (("preview", "beta"), "Feature may be unstable or lack full support."),
+    (
+        ("pricing", "cost", "expensive"),
+        "Could add unexpected licensing or operational costs.",
+    ),
+    (
+        ("training", "certification"),
+        "May require specialized training to realize full value.",
+    ),
+    (
+        ("complex", "overhead", "maintenance"),
+        "Implementation complexity could slow adoption.",
+    ),
+]
+
+
+def _build_keyword_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (keywords, _) in enumerate(DRAWBACK_RULES):
+        for keyword in keywords:
+            automaton.add_word(keyword, min(priority, automaton.get(keyword, priority)))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _match_drawback_rule(text: str) -> int | None:
+    """Return the index of the highest-priority rule with a keyword in ``text``."""
+    if _KEYWORD_AUTOMATON is not None:
+        best = None
+        for _, priority in _KEYWORD_AUTOMATON.iter(text):
+            if best is None or priority < best:
+                best = priority
+                if best == 0:  # nothing can outrank the first rule
+                    break
+        return best
+    for priority, (keywords, _) in enumerate(DRAWBACK_RULES):
+        if any(k in text for k in keywords):
+            return priority
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
 def suggest_drawback(
     title: str, summary: str | None = None, source: str | None = None
 ) -> str:
@@ -137,54 +566,117 @@ def suggest_drawback(
     llm = llm_drawback(title, summary)
     if llm:
         return llm
+    return keyword_drawback(title, summary, source)
 
+
+@functools.lru_cache(maxsize=4096)
+def keyword_drawback(
+    title: str, summary: str | None = None, source: str | None = None
+) -> str:
+    """Return a canned drawback based on keywords or the vendor."""
     text = f"{title} {summary or ''}".lower()
-    if any(k in text for k in ["security", "breach", "privacy"]):
-        return "May raise security and compliance concerns."
-    if any(k in text for k in ["ai", "machine learning", "automation"]):
-        return "Could require significant compute resources and expert oversight."
-    if any(k in text for k in ["cloud", "saas"]):
-        return "Relies on external infrastructure and possible vendor lock-in."
-    if any(k in text for k in ["partnership", "integration"]):
-        return "Integration complexity and potential data silos."
-    if any(k in text for k in ["preview", "beta"]):
-        return "Feature may be unstable or lack full support."
-    if any(k in text for k in ["pricing", "cost", "expensive"]):
-        return "Could add unexpected licensing or operational costs."
-    if any(k in text for k in ["training", "certification"]):
-        return "May require specialized training to realize full value."
-    if any(k in text for k in ["complex", "overhead", "maintenance"]):
-        return "Implementation complexity could slow adoption."
+    rule = _match_drawback_rule(text)
+    if rule is not None:
+        return DRAWBACK_RULES[rule][1]
     if source and source in VENDOR_WEAKNESSES:
         return VENDOR_WEAKNESSES[source]
     return "Consider cost, adoption effort, and governance implications."
 
 
-def extract_summary(entry: feedparser.FeedParserDict) -> str | None:
-    """Pull a longer plain-text summary from common RSS fields."""
+def plain_summary(entry: feedparser.FeedParserDict) -> str | None:
+    """Return the feed's own summary if it is already short plain text.
+
+    Such entries skip HTML stripping, sentence splitting and the LLM.
+    """
+    val = entry.get("summary")
+    if val and len(val) < 300 and "<" not in val and "&" not in val:
+        return val.strip() or None
+    return None
+
+
+def extract_text(entry: feedparser.FeedParserDict) -> str | None:
+    """Pull the plain-text body of an entry from common RSS fields."""
     parts: List[str] = []
     for key in ("summary", "description"):
         val = entry.get(key)
         if val:
             parts.append(val)
     if entry.get("content"):
-        for c in entry.content:
+        for c in entry["content"]:
             if isinstance(c, dict) and c.get("value"):
                 parts.append(c["value"])
     if not parts:
         return None
-    text = strip_html(" ".join(parts))
-    llm = llm_summarize(text)
-    if llm:
-        return llm
-    sentences = re.split(r"(?<=[.!?]) +", text)
+    return strip_html(" ".join(parts))
+
+
+def extract_summary(text: str | None) -> str | None:
+    """Return the first two sentences of ``text`` as a fallback summary."""
+    if not text:
+        return None
+    sentences = _SENT_SPLIT_RE.split(text)
     return " ".join(sentences[:2]).strip()
 
 
+class _TextExtractor(HTMLParser):
+    """Collect the text content of an HTML fragment in a single pass."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+
+    def reset(self) -> None:
+        super().reset()
+        self.parts: List[str] = []
+
+    def handle_data(self, data: str) -> None:
+        self.parts.append(data)
+
+
+_parser_local = threading.local()
+
+
 def strip_html(text: str) -> str:
-    """Remove HTML tags and unescape entities."""
-    clean = re.sub(r"<[^>]+>", "", text)
-    return unescape(clean).strip()
+    """Remove HTML tags, unescape entities and collapse whitespace."""
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = _TextExtractor()
+    parser.reset()
+    parser.feed(text)
+    parser.close()
+    return _WS_RE.sub(" ", "".join(parser.parts)).strip()
+
+
+# LLM summaries keyed by a hash of the text sent to the model
+_llm_cache: Dict[str, str] = {}
+
+
+def load_llm_cache(path: Path) -> None:
+    """Populate the in-memory LLM summary cache from ``path``."""
+    if path.exists():
+        try:
+            _llm_cache.update(load_json(path.read_bytes()))
+        except ValueError:
+            pass
+
+
+def save_llm_cache(path: Path) -> None:
+    if not _llm_cache:
+        return
+    write_atomic(path, dump_json(_llm_cache))
+
+
+def _summary_messages(text: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": "Summarize the following article in 2-3 sentences.",
+        },
+        {"role": "user", "content": text[:4000]},
+    ]
+
+
+def _summary_key(text: str) -> str:
+    return hashlib.blake2b(text[:4000].encode("utf-8"), digest_size=16).hexdigest()
 
 
 def llm_summarize(text: str) -> Optional[str]:
@@ -192,58 +684,55 @@ def llm_summarize(text: str) -> Optional[str]:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key or openai is None:
         return None
+    key = _summary_key(text)
+    if key in _llm_cache:
+        return _llm_cache[key]
     try:
         # Support both openai v1 and legacy versions
         if hasattr(openai, "OpenAI"):
             client = openai.OpenAI(api_key=api_key)
             resp = client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Summarize the following article in 2-3 sentences.",
-                    },
-                    {"role": "user", "content": text[:4000]},
-                ],
+                messages=_summary_messages(text),
                 max_tokens=120,
                 temperature=0.5,
             )
-            return resp.choices[0].message.content.strip()
+            summary = resp.choices[0].message.content.strip()
         else:  # legacy API
             openai.api_key = api_key
             resp = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Summarize the following article in 2-3 sentences.",
-                    },
-                    {"role": "user", "content": text[:4000]},
-                ],
+                messages=_summary_messages(text),
                 max_tokens=120,
                 temperature=0.5,
             )
-            return resp["choices"][0]["message"]["content"].strip()
+            summary = resp["choices"][0]["message"]["content"].strip()
     except Exception:
         return None
+    _llm_cache[key] = summary
+    return summary
 
 
-def llm_drawback(title: str, summary: str | None = None) -> Optional[str]:
-    """Use an LLM to derive a detailed drawback from article details."""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key or openai is None:
-        return None
+def _drawback_messages(title: str, summary: str | None) -> List[Dict[str, str]]:
     prompt = (
         "Provide a single-sentence potential weakness or risk highlighted by the "
         "following article. Be specific and base it on the content.\n"
         f"Title: {title}\nSummary: {summary or ''}"
     )
+    return [{"role": "user", "content": prompt[:4000]}]
+
+
+def llm_drawback(title: str, summary: str | None = None) -> Optional[str]:
+    """Use an LLM to derive a detailed drawback from article details."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key or openai is None:
+        return None
     try:
         if hasattr(openai, "OpenAI"):
             client = openai.OpenAI(api_key=api_key)
             resp = client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt[:4000]}],
+                messages=_drawback_messages(title, summary),
                 max_tokens=60,
                 temperature=0.7,
             )
@@ -252,7 +741,7 @@ def llm_drawback(title: str, summary: str | None = None) -> Optional[str]:
             openai.api_key = api_key
             resp = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt[:4000]}],
+                messages=_drawback_messages(title, summary),
                 max_tokens=60,
                 temperature=0.7,
             )
@@ -261,43 +750,394 @@ def llm_drawback(title: str, summary: str | None = None) -> Optional[str]:
         return None
 
 
-def write_json(digest: Digest, output: Path) -> None:
-    """Merge new articles with existing JSON and tag fetch dates."""
+async def _chat_async(
+    client: "openai.AsyncOpenAI",
+    semaphore: asyncio.Semaphore,
+    messages: List[Dict[str, str]],
+    model: str = "gpt-3.5-turbo",
+    **kwargs,
+) -> Optional[str]:
+    async with semaphore:
+        try:
+            resp = await client.chat.completions.create(
+                model=model, messages=messages, **kwargs
+            )
+            # content is None on refusals and content-filter stops
+            content = resp.choices[0].message.content
+        except Exception:
+            return None
+    if not isinstance(content, str):
+        return None
+    return content.strip() or None
 
-    today = date.today().isoformat()
-    existing: Dict[str, Dict] = {}
 
-    if output.exists():
-        try:
-            current = json.loads(output.read_text(encoding="utf-8"))
-            for item in current:
-                if item.get("link"):
-                    existing[item["link"]] = item
-        except json.JSONDecodeError:
-            pass
+async def _summarize_batch(
+    client: "openai.AsyncOpenAI",
+    semaphore: asyncio.Semaphore,
+    texts: List[str],
+    model: str = "gpt-3.5-turbo",
+) -> List[Optional[str]]:
+    """Summarise several texts in one request, retrying singly if the reply is unusable."""
+    if len(texts) == 1:
+        return [
+            await _chat_async(
+                client,
+                semaphore,
+                _summary_messages(texts[0]),
+                model=model,
+                max_tokens=120,
+                temperature=0.5,
+            )
+        ]
+    items = [{"id": i, "text": text[:4000]} for i, text in enumerate(texts)]
+    reply = await _chat_async(
+        client,
+        semaphore,
+        [
+            {
+                "role": "system",
+                "content": (
+                    "Summarize each article in 2-3 sentences. Reply with a JSON object "
+                    'whose "summaries" key is an array of {"id", "summary"} objects, '
+                    "one per input id."
+                ),
+            },
+            {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+        ],
+        model=model,
+        max_tokens=120 * len(texts),
+        temperature=0.5,
+        response_format={"type": "json_object"},
+    )
+    try:
+        # A failed request (reply is None) or anything but a non-empty string
+        # summary (null, numbers, "") leaves that article to the retries below
+        by_id = {
+            int(item["id"]): item["summary"].strip()
+            for item in load_json(reply)["summaries"]
+            if isinstance(item.get("summary"), str)
+        }
+    except Exception:
+        by_id = {}
+    summaries = [by_id.get(i) or None for i in range(len(texts))]
+
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    retries = await asyncio.gather(
+        *[
+            _chat_async(
+                client,
+                semaphore,
+                _summary_messages(texts[i]),
+                model=model,
+                max_tokens=120,
+                temperature=0.5,
+            )
+            for i in missing
+        ]
+    )
+    for i, summary in zip(missing, retries):
+        summaries[i] = summary
+    return summaries
+
+
+async def _summarize_many(
+    client: "openai.AsyncOpenAI",
+    semaphore: asyncio.Semaphore,
+    texts: List[str],
+    model: str = "gpt-3.5-turbo",
+) -> List[Optional[str]]:
+    """Summarise ``texts`` in batches, skipping any already in the cache."""
+    keys = [_summary_key(text) for text in texts]
+    # Keyed by cache key, so identical texts are only sent once
+    todo = list({k: t for k, t in zip(keys, texts) if k not in _llm_cache}.items())
+    # Set SUMMARY_BATCH_SIZE=1 to send one concurrent request per article instead
+    try:
+        size = max(1, int(os.environ.get("SUMMARY_BATCH_SIZE", "10")))
+    except ValueError:
+        size = 10
+    batches = [todo[i : i + size] for i in range(0, len(todo), size)]
+    results = await asyncio.gather(
+        *[
+            _summarize_batch(client, semaphore, [t for _, t in batch], model)
+            for batch in batches
+        ]
+    )
+    for batch, summaries in zip(batches, results):
+        for (key, _), summary in zip(batch, summaries):
+            if summary:
+                _llm_cache[key] = summary
+    return [_llm_cache.get(key) for key in keys]
+
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1"
+
+
+async def _summarize_ollama(
+    texts: List[str], semaphore: asyncio.Semaphore
+) -> List[Optional[str]]:
+    """Summarise ``texts`` with a local Ollama model, using the summary cache."""
+    url = os.environ.get("OLLAMA_URL", "http://localhost:11434/api/generate")
+    model = os.environ.get("OLLAMA_MODEL", "llama3.2:1b")
+
+    async def summarize(session: aiohttp.ClientSession, text: str) -> Optional[str]:
+        key = _summary_key(text)
+        if key in _llm_cache:
+            return _llm_cache[key]
+        payload = {
+            "model": model,
+            "prompt": "Summarize the following article in 2-3 sentences.\n\n" + text[:4000],
+            "stream": False,
+            "options": {"num_predict": 120},
+        }
+        async with semaphore:
+            try:
+                async with session.post(
+                    url, json=payload, timeout=aiohttp.ClientTimeout(total=60)
+                ) as resp:
+                    resp.raise_for_status()
+                    data = await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return None
+        if not isinstance(data, dict) or not isinstance(data.get("response"), str):
+            return None
+        summary = data["response"].strip() or None
+        if summary:
+            _llm_cache[key] = summary
+        return summary
+
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(*[summarize(session, text) for text in texts])
+
+
+async def enrich_articles(articles: List[Article]) -> None:
+    """Fill in LLM summaries and drawbacks for ``articles``.
+
+    Articles carrying ``text`` are first summarised by the
+    ``$SUMMARY_BACKEND`` model (Ollama or OpenRouter), and whatever it leaves
+    out by OpenAI in batches of ``$SUMMARY_BATCH_SIZE`` (default 10) per
+    request; then any article without a drawback gets one from OpenAI.
+    Requests run concurrently with at most eight in flight, and each client
+    is closed before returning. Without the async OpenAI client the blocking
+    helpers run on worker threads instead.
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    client = None
+    if api_key and openai is not None and hasattr(openai, "AsyncOpenAI"):
+        client = openai.AsyncOpenAI(api_key=api_key)
+    try:
+        semaphore = asyncio.Semaphore(8)
+
+        pending = [a for a in articles if a.text]
+        backend = os.environ.get("SUMMARY_BACKEND", "openai")
+        router_key = os.environ.get("OPENROUTER_API_KEY")
+        summaries: List[Optional[str]] = [None] * len(pending)
+        if backend == "ollama":
+            summaries = await _summarize_ollama([a.text for a in pending], semaphore)
+        elif backend == "openrouter" and router_key and hasattr(openai, "AsyncOpenAI"):
+            router = openai.AsyncOpenAI(api_key=router_key, base_url=OPENROUTER_URL)
+            router_model = os.environ.get(
+                "OPENROUTER_MODEL", "meta-llama/llama-3.2-1b-instruct"
+            )
+            try:
+                summaries = await _summarize_many(
+                    router, semaphore, [a.text for a in pending], router_model
+                )
+            finally:
+                await router.close()
+        for article, summary in zip(pending, summaries):
+            if summary:
+                article.summary = summary
+
+        # Anything the configured backend could not summarise falls back to OpenAI
+        pending = [a for a, summary in zip(pending, summaries) if not summary]
+        if client is None:
+            summaries = await asyncio.gather(
+                *[asyncio.to_thread(llm_summarize, a.text) for a in pending]
+            )
+        else:
+            summaries = await _summarize_many(
+                client, semaphore, [a.text for a in pending]
+            )
+        for article, summary in zip(pending, summaries):
+            if summary:
+                article.summary = summary
+
+        async def add_drawback(article: Article) -> None:
+            if client is None:
+                article.drawback = await asyncio.to_thread(
+                    suggest_drawback, article.title, article.summary, article.source
+                )
+                return
+            drawback = await _chat_async(
+                client,
+                semaphore,
+                _drawback_messages(article.title, article.summary),
+                max_tokens=60,
+                temperature=0.7,
+            )
+            article.drawback = drawback or keyword_drawback(
+                article.title, article.summary, article.source
+            )
+
+        await asyncio.gather(*[add_drawback(a) for a in articles if a.drawback is None])
+    finally:
+        if client is not None:
+            # Release the httpx pool before asyncio.run closes the loop
+            await client.close()
+
+
+ARCHIVE_COLUMNS = (
+    "link",
+    "title",
+    "summary",
+    "published",
+    "source",
+    "category",
+    "drawbacks",
+    "fetched",
+)
+# JSON export field order, matching what the React app has always received
+_EXPORT_FIELDS = (
+    "title",
+    "link",
+    "summary",
+    "published",
+    "source",
+    "category",
+    "drawbacks",
+    "fetched",
+)
+_INSERT_SQL = (
+    f"INSERT INTO articles({', '.join(ARCHIVE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in ARCHIVE_COLUMNS)})"
+)
+
 
-    for source, articles in digest.feeds.items():
-        for art in articles:
-            existing[art.link] = {
-                "title": art.title,
-                "link": art.link,
-                "summary": art.summary,
-                "published": art.published,
-                "source": art.source,
-                "category": art.category,
-                "drawbacks": suggest_drawback(art.title, art.summary, art.source),
-                "fetched": today,
+def open_archive(path: Path) -> sqlite3.Connection:
+    """Open the SQLite archive of every article seen, creating it if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS articles(link TEXT PRIMARY KEY, title TEXT, "
+        "summary TEXT, published TEXT, source TEXT, category TEXT, drawbacks TEXT, "
+        "fetched TEXT)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS articles_fetched ON articles(fetched)")
+    return conn
+
+
+def load_known_articles(
+    archive: Path, export: Path | None = None
+) -> Dict[str, tuple[str | None, str | None]]:
+    """Map each archived link that has a summary to its summary and drawback.
+
+    Without an archive (e.g. a fresh CI checkout) the JSON ``export`` is
+    read instead.
+    """
+    if not archive.exists():
+        if export is None:
+            return {}
+        try:
+            return {
+                item["link"]: (item["summary"], item.get("drawbacks"))
+                for item in _iter_json_records(export)
+                if item.get("link") and item.get("summary")
             }
+        except Exception:
+            return {}
+    conn = sqlite3.connect(archive)
+    try:
+        rows = conn.execute(
+            "SELECT link, summary, drawbacks FROM articles "
+            "WHERE summary IS NOT NULL AND summary != ''"
+        )
+        return {link: (summary, drawback) for link, summary, drawback in rows}
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
 
-    merged = list(existing.values())
-    merged.sort(key=lambda x: x.get("fetched", ""), reverse=True)
 
-    output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+def _iter_json_records(path: Path) -> Iterator[Dict]:
+    """Yield the records of a JSON array file one at a time."""
+    with path.open("rb") as fh:
+        if ijson is not None:
+            yield from ijson.items(fh, "item", use_float=True)
+        else:
+            yield from load_json(fh.read())
 
 
-def render_html(digest: Digest, output: Path) -> None:
-    template_str = """
+def _import_json(conn: sqlite3.Connection, path: Path) -> None:
+    """Seed an empty archive from a previously written articles JSON file."""
+    try:
+        conn.executemany(
+            _INSERT_SQL + " ON CONFLICT(link) DO NOTHING",
+            (
+                tuple(item.get(col, "" if col == "fetched" else None) for col in ARCHIVE_COLUMNS)
+                for item in _iter_json_records(path)
+                if item.get("link")
+            ),
+        )
+    except Exception:
+        # A missing or corrupt export just means starting a fresh archive
+        pass
+
+
+def write_json(
+    digest: Digest, output: Path, archive: Path, limit: int | None = None
+) -> None:
+    """Add new articles to the archive and export it as JSON, newest first.
+
+    New links are inserted and links seen before only get their fetch date
+    bumped, so each run touches just the digest's rows. The export is built
+    by SQLite itself; ``limit`` caps it to the most recently fetched rows.
+    """
+
+    today = date.today().isoformat()
+    conn = open_archive(archive)
+    try:
+        with conn:
+            if conn.execute("SELECT 1 FROM articles LIMIT 1").fetchone() is None:
+                _import_json(conn, output)
+            conn.executemany(
+                _INSERT_SQL + " ON CONFLICT(link) DO UPDATE SET fetched=excluded.fetched",
+                [
+                    (
+                        art.link,
+                        art.title,
+                        art.summary,
+                        art.published,
+                        art.source,
+                        art.category,
+                        art.drawback,
+                        today,
+                    )
+                    for articles in digest.feeds.values()
+                    for art in articles
+                ],
+            )
+
+        fields = ", ".join(f"'{name}', {name}" for name in _EXPORT_FIELDS)
+        rows = conn.execute(
+            f"SELECT json_object({fields}) FROM articles "
+            "ORDER BY fetched DESC, rowid LIMIT ?",
+            (limit or -1,),
+        )
+        with atomic_path(output) as tmp, tmp.open(
+            "w", encoding="utf-8", buffering=1 << 20
+        ) as fh:
+            sep = "[\n  "
+            for (payload,) in rows:
+                fh.write(sep)
+                fh.write(payload)
+                sep = ",\n  "
+            fh.write("[]" if sep.startswith("[") else "\n]")
+    finally:
+        conn.close()
+
+
+_HTML_TEMPLATE = """
     <!doctype html>
     <html lang="en">
     <head>
@@ -321,23 +1161,63 @@ def render_html(digest: Digest, output: Path) -> None:
     </div>
     </body>
     </html>
-    """
-    env = jinja2.Environment(autoescape=True)
-    tmpl = env.from_string(template_str)
-    html = tmpl.render(digest=digest)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(html, encoding="utf-8")
+"""
 
+_JINJA_ENV = jinja2.Environment(autoescape=True, auto_reload=False)
+_TEMPLATE = _JINJA_ENV.from_string(_HTML_TEMPLATE)
 
-def send_email(digest: Digest, subject: str = "Daily Analytics Digest") -> None:
+
+def render_html(digest: Digest, output: Path) -> None:
+    # Stream the render to disk rather than building the whole page in memory
+    with atomic_path(output) as tmp:
+        _TEMPLATE.stream(digest=digest).dump(str(tmp), encoding="utf-8")
+
+
+@contextmanager
+def smtp_session() -> Iterator[smtplib.SMTP]:
+    """Yield an SMTP connection that has already done STARTTLS and login."""
     host = os.environ.get("SMTP_HOST")
     user = os.environ.get("SMTP_USER")
     password = os.environ.get("SMTP_PASS")
+    port = int(os.environ.get("SMTP_PORT", "587"))
+
+    if not all([host, user, password]):
+        raise RuntimeError("Missing SMTP or email configuration environment variables")
+
+    # Implicit TLS on 465 saves the STARTTLS round trip
+    if port == 465:
+        server = smtplib.SMTP_SSL(host, port)
+    else:
+        server = smtplib.SMTP(host, port)
+    with server:
+        if port != 465:
+            server.starttls()
+        server.login(user, password)
+        yield server
+
+
+RECIPIENT_BATCH_SIZE = 50
+
+
+def send_many(server: smtplib.SMTP, messages: Iterable[MIMEText]) -> None:
+    """Send each message over an existing SMTP session.
+
+    Each message is rendered once and sent to its recipients in batches of
+    ``RECIPIENT_BATCH_SIZE``.
+    """
+    for msg in messages:
+        payload = msg.as_string()
+        recipients = [r.strip() for r in msg["To"].split(",") if r.strip()]
+        for i in range(0, len(recipients), RECIPIENT_BATCH_SIZE):
+            server.sendmail(msg["From"], recipients[i : i + RECIPIENT_BATCH_SIZE], payload)
+
+
+def send_email(digest: Digest, subject: str = "Daily Analytics Digest") -> None:
+    user = os.environ.get("SMTP_USER")
     sender = os.environ.get("EMAIL_FROM", user)
     recipients = os.environ.get("EMAIL_TO")
-    port = int(os.environ.get("SMTP_PORT", "587"))
 
-    if not all([host, user, password, sender, recipients]):
+    if not all([sender, recipients]):
         raise RuntimeError("Missing SMTP or email configuration environment variables")
 
     msg = MIMEText(digest.to_text())
@@ -345,10 +1225,8 @@ def send_email(digest: Digest, subject: str = "Daily Analytics Digest") -> None:
     msg["From"] = sender
     msg["To"] = recipients
 
-    with smtplib.SMTP(host, port) as server:
-        server.starttls()
-        server.login(user, password)
-        server.sendmail(sender, recipients.split(","), msg.as_string())
+    with smtp_session() as server:
+        send_many(server, [msg])
 
 
 def parse_args() -> argparse.Namespace:
@@ -362,19 +1240,58 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--json", help="Path to write JSON data for the React app"
     )
+    parser.add_argument(
+        "--archive",
+        default="articles.db",
+        help="SQLite archive of every article seen, used to build the JSON file",
+    )
+    parser.add_argument(
+        "--json-limit",
+        type=int,
+        default=0,
+        help="Only export the N most recently fetched articles to JSON (0 for all)",
+    )
+    parser.add_argument(
+        "--feed-cache",
+        default=".feed_cache.json",
+        help="Where to keep ETag/Last-Modified data for conditional feed requests",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        default=".llm_cache.json",
+        help="Where to keep LLM summaries so each article is only summarised once",
+    )
     parser.add_argument(
         "--send-email", action="store_true", help="Email the digest using SMTP settings"
     )
     return parser.parse_args()
 
 
+async def write_outputs(digest: Digest, args: argparse.Namespace) -> None:
+    """Write the HTML report and JSON export concurrently; they are independent."""
+    writes = [asyncio.to_thread(render_html, digest, Path(args.output))]
+    if args.json:
+        writes.append(
+            asyncio.to_thread(
+                write_json, digest, Path(args.json), Path(args.archive), args.json_limit
+            )
+        )
+    await asyncio.gather(*writes)
+
+
 def main() -> None:
     args = parse_args()
     feeds = load_feeds(args.config)
-    digest = build_digest(feeds)
-    render_html(digest, Path(args.output))
-    if args.json:
-        write_json(digest, Path(args.json))
+    cache_path = Path(args.feed_cache)
+    cache = load_feed_cache(cache_path)
+    load_llm_cache(Path(args.llm_cache))
+    known = load_known_articles(
+        Path(args.archive), Path(args.json) if args.json else None
+    )
+    digest = build_digest(feeds, cache, known)
+    save_feed_cache(cache, cache_path)
+    save_llm_cache(Path(args.llm_cache))
+    asyncio.run(write_outputs(digest, args))
     if args.send_email:
         send_email(digest)
 
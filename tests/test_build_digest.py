@@ -0,0 +1,34 @@
+import asyncio
+
+import news_agent
+from news_agent import Feed
+
+BODY = (
+    b"<rss><channel>"
+    + b"".join(
+        b"<item><title>Item %d</title><link>https://example.com/%d</link>"
+        b"<description>Summary %d.</description></item>" % (i, i, i)
+        for i in range(5)
+    )
+    + b"</channel></rss>"
+)
+
+
+def test_feeds_sharing_a_url_keep_their_own_item_count(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    responses = iter([(200, BODY, {"etag": "v1"}), (304, None, {})])
+
+    async def fake_fetch(session, url, cached=None):
+        return next(responses)
+
+    monkeypatch.setattr(news_agent, "fetch_bytes", fake_fetch)
+    feeds = [
+        Feed(name="A", url="https://example.com/rss", max_items=3),
+        Feed(name="B", url="https://example.com/rss", max_items=2),
+    ]
+    cache = {}
+    for _ in range(2):
+        digest = asyncio.run(news_agent.build_digest_async(feeds, cache))
+        assert len(digest.feeds["A"]) == 3
+        assert len(digest.feeds["B"]) == 2
+        assert [a.source for a in digest.feeds["B"]] == ["B", "B"]
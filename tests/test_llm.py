@@ -0,0 +1,127 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import news_agent
+
+
+class FakeClient:
+    """Minimal stand-in for openai.AsyncOpenAI returning canned replies."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = self.reply(kwargs)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_chat_returns_none_when_content_is_missing():
+    client = FakeClient(lambda kwargs: None)
+    reply = asyncio.run(
+        news_agent._chat_async(client, asyncio.Semaphore(1), [{"role": "user", "content": "x"}])
+    )
+    assert reply is None
+
+
+def test_batch_retries_articles_whose_summary_is_null():
+    def reply(kwargs):
+        if "response_format" in kwargs:
+            return json.dumps(
+                {"summaries": [{"id": 0, "summary": "First."}, {"id": 1, "summary": None}]}
+            )
+        return "Retried."
+
+    client = FakeClient(reply)
+    summaries = asyncio.run(
+        news_agent._summarize_batch(client, asyncio.Semaphore(1), ["a", "b"])
+    )
+    assert summaries == ["First.", "Retried."]
+    assert len(client.requests) == 2
+
+
+def test_invalid_batch_size_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("SUMMARY_BATCH_SIZE", "lots")
+    monkeypatch.setattr(news_agent, "_llm_cache", {})
+    client = FakeClient(
+        lambda kwargs: json.dumps(
+            {"summaries": [{"id": i, "summary": f"S{i}"} for i in range(10)]}
+        )
+    )
+    texts = [f"text {i}" for i in range(12)]
+    asyncio.run(news_agent._summarize_many(client, asyncio.Semaphore(4), texts))
+    assert sorted(len(json.loads(r["messages"][1]["content"])) for r in client.requests) == [2, 10]
+
+
+def test_batch_retries_every_article_when_the_reply_has_no_content():
+    def reply(kwargs):
+        return None if "response_format" in kwargs else "Retried."
+
+    client = FakeClient(reply)
+    summaries = asyncio.run(
+        news_agent._summarize_batch(client, asyncio.Semaphore(1), ["a", "b", "c"])
+    )
+    assert summaries == ["Retried."] * 3
+    assert len(client.requests) == 4
+
+
+def test_enrich_articles_closes_the_client(monkeypatch):
+    client = FakeClient(lambda kwargs: "A drawback.")
+    client.closed = False
+
+    async def close():
+        client.closed = True
+
+    client.close = close
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(news_agent, "openai", SimpleNamespace(AsyncOpenAI=lambda **kw: client))
+    article = news_agent.Article(title="t", link="https://e.com/1", summary="s")
+    asyncio.run(news_agent.enrich_articles([article]))
+    assert article.drawback == "A drawback."
+    assert client.closed
+
+
+def test_ollama_settings_are_read_at_call_time_and_bad_replies_ignored(monkeypatch):
+    monkeypatch.setenv("OLLAMA_URL", "http://ollama.test/api/generate")
+    monkeypatch.setenv("OLLAMA_MODEL", "tiny")
+    monkeypatch.setattr(news_agent, "_llm_cache", {})
+    posts = []
+
+    class FakeResponse:
+        def __init__(self, data):
+            self.data = data
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        async def json(self):
+            return self.data
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def post(self, url, json, timeout):
+            posts.append((url, json["model"]))
+            bad = "bad" in json["prompt"]
+            return FakeResponse(["not", "an", "object"] if bad else {"response": " Ok. "})
+
+    monkeypatch.setattr(news_agent.aiohttp, "ClientSession", FakeSession)
+    summaries = asyncio.run(
+        news_agent._summarize_ollama(["good", "bad"], asyncio.Semaphore(2))
+    )
+    assert summaries == ["Ok.", None]
+    assert posts[0] == ("http://ollama.test/api/generate", "tiny")
@@ -0,0 +1,97 @@
+import logging
+from types import SimpleNamespace
+
+import news_agent
+from news_agent import parse_feed_body, stream_entries
+
+RSS_WITH_EXTENSIONS = b"""<?xml version="1.0"?>
+<rss version="2.0"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/"
+     xmlns:media="http://search.yahoo.com/mrss/"
+     xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+  <channel>
+    <title>Channel</title>
+    <item>
+      <title>Real title</title>
+      <itunes:title>Itunes title</itunes:title>
+      <link>https://example.com/a</link>
+      <description>Real description.</description>
+      <media:description>MEDIA</media:description>
+      <itunes:summary>Itunes summary</itunes:summary>
+      <content:encoded><![CDATA[<p>Body</p>]]></content:encoded>
+      <pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+  <title>Feed</title>
+  <entry>
+    <title>Atom title</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/alt"/>
+    <summary>Atom summary</summary>
+    <media:description>MEDIA</media:description>
+    <published>2024-01-01T00:00:00Z</published>
+  </entry>
+</feed>
+"""
+
+
+def test_namespaced_extensions_do_not_override_core_rss_fields():
+    [entry] = stream_entries(RSS_WITH_EXTENSIONS, 5)
+    assert entry["title"] == "Real title"
+    assert entry["link"] == "https://example.com/a"
+    assert entry["summary"] == "Real description."
+    assert entry["content"] == [{"value": "<p>Body</p>"}]
+    assert entry["published"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_atom_entry_uses_alternate_link_and_ignores_extensions():
+    [entry] = stream_entries(ATOM, 5)
+    assert entry["title"] == "Atom title"
+    assert entry["link"] == "https://example.com/alt"
+    assert entry["summary"] == "Atom summary"
+    assert entry["published"] == "2024-01-01T00:00:00Z"
+
+
+def test_stops_after_max_items():
+    body = b"<rss><channel>" + b"<item><title>t</title></item>" * 5 + b"</channel></rss>"
+    assert len(stream_entries(body, 2)) == 2
+
+
+def test_permalink_guid_stands_in_for_a_missing_link():
+    body = (
+        b"<rss><channel>"
+        b'<item><title>a</title><guid isPermaLink="true">https://e.com/3</guid></item>'
+        b"<item><title>b</title><guid>https://e.com/4</guid></item>"
+        b'<item><title>c</title><link>https://e.com/5</link><guid isPermaLink="false">x</guid></item>'
+        b"</channel></rss>"
+    )
+    links = [e["link"] for e in stream_entries(body, 5)]
+    assert links == ["https://e.com/3", "https://e.com/4", "https://e.com/5"]
+
+
+def test_relative_or_missing_links_fall_back_to_feedparser():
+    atom = (
+        b'<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://e.com/blog/">'
+        b'<entry><title>a</title><link href="post-1"/></entry></feed>'
+    )
+    assert parse_feed_body(atom, 5).entries[0]["link"] == "https://e.com/blog/post-1"
+    rss = b'<rss><channel><item><title>a</title><guid isPermaLink="false">x</guid></item></channel></rss>'
+    assert parse_feed_body(rss, 5).entries[0].get("link", "") == ""
+
+
+def test_feedparser_rs_errors_are_logged_before_falling_back(monkeypatch, caplog):
+    def parse(body, limits):
+        raise TypeError("unexpected keyword argument 'limits'")
+
+    fake = SimpleNamespace(ParserLimits=lambda **kw: kw, parse=parse)
+    monkeypatch.setattr(news_agent, "feedparser_rs", fake)
+    body = b"<rss><channel><item><title>a &nbsp; b</title></item></channel></rss>"
+    with caplog.at_level(logging.WARNING, logger="news_agent"):
+        parsed = parse_feed_body(body, 5)
+    assert len(parsed.entries) == 1
+    assert "falling back to feedparser" in caplog.text